@@ -11,7 +11,10 @@ from jsl.nlds.bootstrap_filter import filter
 
 
 def plot_samples(sample_state, sample_obs, ax=None):
-    fig, ax = plt.subplots()
+    if ax is None:
+        fig, ax = plt.subplots()
+    else:
+        fig = ax.figure
     ax.plot(*sample_state.T, label="state space")
     ax.scatter(*sample_obs.T, s=60, c="tab:green", marker="+")
     ax.scatter(*sample_state[0], c="black", zorder=3)
@@ -48,12 +51,17 @@ def main():
     Rt = jnp.eye(2) * 0.05
 
     key = random.PRNGKey(314)
-    model = NLDS(lambda x: fz(x, dt), fx, Qt, Rt)
+    model = NLDS(jax.tree_util.Partial(fz, dt=dt), fx, Qt, Rt)
     sample_state, sample_obs = model.sample(key, x0, nsteps)
 
+    # Batched version of fz acting on all particles at once,
+    # x: array(n_particles, state_size)
+    @jax.jit
+    def fz_vec(x):
+        return x + dt * jnp.stack([jnp.sin(x[:, 1]), jnp.cos(x[:, 0])], axis=1)
+
     n_particles = 3_000
-    fz_vec = jax.vmap(fz, in_axes=(0, None))
-    particle_filter = NLDS(lambda x: fz_vec(x, dt), fx, Qt, Rt)
+    particle_filter = NLDS(fz_vec, fx, Qt, Rt)
     pf_mean = filter(particle_filter, key, x0, sample_obs, n_particles)
 
     dict_figures = {}
@@ -10,7 +10,7 @@
 
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
-from jax import random
+import numpy as np
 
 # Import data and baseline solution
 from jsl.demos import logreg_biclusters as demo
@@ -77,16 +77,18 @@ def main():
     ### *** Ploting surface predictive distribution ***
     colors = ["black" if el else "white" for el in y]
     dict_figures = {}
-    key = random.PRNGKey(31415)
-    nsamples = 5000
 
-    # EEKF surface predictive distribution
-    eekf_samples = random.multivariate_normal(key, w_eekf, P_eekf, (nsamples,))
-    Z_eekf = sigmoid(jnp.einsum("mij,sm->sij", Phispace, eekf_samples))
-    Z_eekf = Z_eekf.mean(axis=0)
+    # EEKF surface predictive distribution, using the probit approximation
+    # p(y=1|x) ≈ sigmoid(mu / sqrt(1 + pi / 8 * sigma^2)) of the logistic-Gaussian
+    # integral, where mu = w'x and sigma^2 = x'Px at every point of the grid.
+    # The Laplace and MCMC surfaces of logreg_biclusters average Monte Carlo
+    # samples instead, so the title flags the different approximation
+    mu_grid = jnp.einsum("mij,m->ij", Phispace, w_eekf)
+    var_grid = jnp.einsum("mij,mn,nij->ij", Phispace, P_eekf, Phispace)
+    Z_eekf = sigmoid(mu_grid / jnp.sqrt(1 + jnp.pi / 8 * var_grid))
 
     fig_eekf, ax = plt.subplots()
-    title = "EEKF  Predictive Distribution"
+    title = "EEKF  Predictive Distribution (probit approximation)"
     demo.plot_posterior_predictive(ax, X, Xspace, Z_eekf, title, colors)
     dict_figures["logistic_regression_surface_eekf"] = fig_eekf
 
@@ -94,14 +96,19 @@ def main():
     P_eekf_hist_diag = jnp.diagonal(P_eekf_hist, axis1=1, axis2=2)
     # P_laplace_diag = jnp.sqrt(jnp.diagonal(SN))
     lcolors = ["black", "tab:blue", "tab:red"]
-    elements = w_eekf_hist.T, P_eekf_hist_diag.T, w_laplace, lcolors
-    timesteps = jnp.arange(n_datapoints) + 1
+    # Transfer the histories to the host once, before looping over the weights
+    W_hist = np.asarray(w_eekf_hist.T)
+    W_std_hist = np.asarray(jnp.sqrt(P_eekf_hist_diag.T))
+    W_laplace = np.asarray(w_laplace)
+    timesteps = np.arange(n_datapoints) + 1
 
-    for k, (wk, Pk, wk_laplace, c) in enumerate(zip(*elements)):
+    for k, c in enumerate(lcolors):
         fig_weight_k, ax = plt.subplots()
-        ax.errorbar(timesteps, wk, jnp.sqrt(Pk), c=c, label=f"$w_{k}$ online (EEKF)")
+        ax.errorbar(
+            timesteps, W_hist[k], W_std_hist[k], c=c, label=f"$w_{k}$ online (EEKF)"
+        )
         ax.axhline(
-            y=wk_laplace,
+            y=W_laplace[k],
             c=c,
             linestyle="dotted",
             label=f"$w_{k}$ batch (Laplace)",
@@ -62,11 +62,9 @@ def sample_observations(key, f, n_obs, xmin, xmax, x_noise=0.1, y_noise=3.0):
     y_noise = jax.random.normal(key_y, (n_obs,)) * y_noise
     x = jnp.linspace(xmin, xmax, n_obs) + x_noise
     y = f(x) + y_noise
-    X = jnp.c_[x, y]
 
-    shuffled_ixs = jax.random.permutation(key_shuffle, jnp.arange(n_obs))
-    X, y = jnp.array(X[shuffled_ixs, :].T)
-    return X, y
+    shuffled_ixs = jax.random.permutation(key_shuffle, n_obs)
+    return x[shuffled_ixs], y[shuffled_ixs]
 
 
 def plot_mlp_prediction(key, xobs, yobs, xtest, fw, w, Sw, ax, n_samples=100):
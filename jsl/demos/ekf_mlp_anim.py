@@ -9,16 +9,80 @@ import jax.numpy as jnp
 import matplotlib.animation as animation
 import matplotlib.pyplot as plt
 from jax.flatten_util import ravel_pytree
-from jax.random import PRNGKey, multivariate_normal, normal, split
+from jax.random import PRNGKey, fold_in, normal, split
 
 from jsl.demos.ekf_mlp import MLP, apply, sample_observations
 from jsl.nlds.base import NLDS
 from jsl.nlds.extended_kalman_filter import filter
 
 
+@partial(jax.jit, static_argnames=("n_hidden", "n_out"))
+def fwd_mlp_obs_weights(W, x, n_hidden, n_out):
+    """
+    Evaluate the MLP at every input for every set of weights.
+
+    Parameters
+    ----------
+    W: array(n_samples, n_params)
+        Unravelled weights of the MLP
+    x: array(n_test, n_in)
+        Points to evaluate the MLP
+    n_hidden: int
+        Number of hidden units
+    n_out: int
+        Number of output units
+
+    Returns
+    -------
+    * array(n_samples, n_test, n_out)
+    """
+    model = MLP([n_hidden, n_out])
+    # Only the structure of the parameters is needed to unravel W
+    _, unflatten_fn = ravel_pytree(model.init(PRNGKey(0), x[:1]))
+    fwd_mlp = partial(apply, model=model, unflatten_fn=unflatten_fn)
+    # vectorised for multiple observations
+    fwd_mlp_obs = jax.vmap(fwd_mlp, in_axes=[None, 0])
+    # vectorised for multiple observations and weights
+    return jax.vmap(fwd_mlp_obs, in_axes=[0, None])(W, x)
+
+
+@partial(jax.jit, static_argnames=("n_hidden", "n_out"))
+def fwd_mlp_frames(W_hist, x, n_hidden, n_out):
+    """
+    Evaluate the sampled MLPs of every frame of the animation.
+    Defined at module level so that the compiled function is
+    cached across calls to main.
+
+    Parameters
+    ----------
+    W_hist: array(n_frames, n_samples, n_params)
+        Unravelled weights of the MLP at every frame
+    x: array(n_test, n_in)
+        Points to evaluate the MLP
+    n_hidden: int
+        Number of hidden units
+    n_out: int
+        Number of output units
+
+    Returns
+    -------
+    * array(n_frames, n_samples, n_test, n_out)
+    """
+    fwd_mlp_weights = partial(fwd_mlp_obs_weights, n_hidden=n_hidden, n_out=n_out)
+    return jax.vmap(fwd_mlp_weights, in_axes=[0, None])(W_hist, x)
+
+
+# Shards the frames across devices; n_hidden and n_out are broadcast as static
+fwd_mlp_frames_pmap = jax.pmap(
+    fwd_mlp_frames, in_axes=(0, None, None, None), static_broadcasted_argnums=(2, 3)
+)
+
+
 def main(fx, fz, filepath):
     key = PRNGKey(314)
     key_sample_obs, key_weights, key_init = split(key, 3)
+    # Derived separately so that the data and initial weights match split(key, 3)
+    key_samples = fold_in(key, 3)
 
     # *** MLP configuration ***
     n_hidden = 6
@@ -33,10 +97,6 @@ def main(fx, fz, filepath):
     W0, unflatten_fn = ravel_pytree(variables)
 
     fwd_mlp = partial(apply, model=model, unflatten_fn=unflatten_fn)
-    # vectorised for multiple observations
-    fwd_mlp_obs = jax.vmap(fwd_mlp, in_axes=[None, 0])
-    # vectorised for multiple observations and weights
-    fwd_mlp_obs_weights = jax.vmap(fwd_mlp_obs, in_axes=[0, None])
 
     # *** Generating training and test data ***
     n_obs = 200
@@ -46,28 +106,50 @@ def main(fx, fz, filepath):
         key_sample_obs, fx, n_obs, xmin, xmax, x_noise=0, y_noise=sigma_y
     )
     xtest = jnp.linspace(x.min(), x.max(), n_obs)
+    xtest_col = xtest[:, None]
 
     # *** MLP Training with EKF ***
     n_params = W0.size
-    W0 = normal(key_weights, (n_params,)) * 1  # initial random guess
-    Q = jnp.eye(n_params) * 1e-4  # parameters do not change
-    R = jnp.eye(1) * sigma_y**2  # observation noise is fixed
-    Vinit = jnp.eye(n_params) * 100  # vague prior
+    # Keep the whole filter in single precision; the EKF covariance update
+    # uses the (symmetric) Joseph form, which is stable in float32
+    dtype = jnp.float32
+    W0 = normal(key_weights, (n_params,), dtype) * 1  # initial random guess
+    Q = jnp.eye(n_params, dtype=dtype) * 1e-4  # parameters do not change
+    R = jnp.eye(1, dtype=dtype) * sigma_y**2  # observation noise is fixed
+    Vinit = jnp.eye(n_params, dtype=dtype) * 100  # vague prior
 
     ekf = NLDS(fz, fwd_mlp, Q, R)
     _, ekf_hist = filter(
-        ekf, W0, y[:, None], x[:, None], Vinit, return_params=["mean", "cov"]
+        ekf,
+        W0,
+        y[:, None].astype(dtype),
+        x[:, None].astype(dtype),
+        Vinit,
+        return_params=["mean", "cov"],
     )
     ekf_mu_hist, ekf_Sigma_hist = ekf_hist["mean"], ekf_hist["cov"]
 
-    xtest = jnp.linspace(x.min(), x.max(), 200)
     fig, ax = plt.subplots()
 
+    # Factorise every posterior covariance and draw all the standard-normal
+    # noise at once, then evaluate the sampled MLPs for every frame in a
+    # single call so that the animation callback only indexes the result
+    n_samples = 100
+    L_hist = jax.vmap(jnp.linalg.cholesky)(ekf_Sigma_hist)
+    Z = normal(key_samples, (n_obs, n_samples, n_params))
+    W_samples_hist = ekf_mu_hist[:, None, :] + jnp.einsum("tij,tkj->tki", L_hist, Z)
+    n_devices = jax.local_device_count()
+    if n_devices > 1 and n_obs % n_devices == 0:
+        # Shard the frames across the available devices
+        W_samples_shards = W_samples_hist.reshape(n_devices, -1, n_samples, n_params)
+        yhat_hist = fwd_mlp_frames_pmap(W_samples_shards, xtest_col, n_hidden, n_out)
+        yhat_hist = yhat_hist.reshape(n_obs, *yhat_hist.shape[2:])
+    else:
+        yhat_hist = fwd_mlp_frames(W_samples_hist, xtest_col, n_hidden, n_out)
+
     def func(i):
         plt.cla()
-        W, SW = ekf_mu_hist[i], ekf_Sigma_hist[i]
-        W_samples = multivariate_normal(key, W, SW, (100,))
-        sample_yhat = fwd_mlp_obs_weights(W_samples, xtest[:, None])
+        sample_yhat = yhat_hist[i]
         for sample in sample_yhat:
             ax.plot(xtest, sample, c="tab:gray", alpha=0.07)
         ax.plot(xtest, sample_yhat.mean(axis=0))
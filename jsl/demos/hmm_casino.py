@@ -37,15 +37,11 @@ def find_dishonest_intervals(z_hist):
     -------
     list of tuples with span of values
     """
-    spans = []
-    x_init = 0
-    for t, _ in enumerate(z_hist[:-1]):
-        if z_hist[t + 1] == 0 and z_hist[t] == 1:
-            x_end = t
-            spans.append((x_init, x_end))
-        elif z_hist[t + 1] == 1 and z_hist[t] == 0:
-            x_init = t + 1
-    return spans
+    z_hist = np.asarray(z_hist)
+    # Prepend a 0 so that a sequence starting in state 1 opens a span at t=0
+    starts = np.where(np.diff(z_hist, prepend=0) == 1)[0]
+    ends = np.where(np.diff(z_hist) == -1)[0]
+    return list(zip(starts, ends))
 
 
 def plot_inference(inference_values, z_hist, ax, state=1, map_estimate=False):
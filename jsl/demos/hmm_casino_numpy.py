@@ -6,9 +6,17 @@
 # the die was biased.
 # Original matlab code: https://github.com/probml/pmtk3/blob/master/demos/casinoDemo.m
 
+import jax.numpy as jnp
 import matplotlib.pyplot as plt
 import numpy as np
+from jax.random import PRNGKey
 
+from jsl.hmm.hmm_lib import (
+    HMMJax,
+    hmm_forwards_backwards_jax,
+    hmm_sample_jax,
+    hmm_viterbi_jax,
+)
 from jsl.hmm.hmm_numpy_lib import (
     HMMNumpy,
     hmm_forwards_backwards_numpy,
@@ -31,15 +39,11 @@ def find_dishonest_intervals(z_hist):
     -------
     list of tuples with span of values
     """
-    spans = []
-    x_init = 0
-    for t, _ in enumerate(z_hist[:-1]):
-        if z_hist[t + 1] == 0 and z_hist[t] == 1:
-            x_end = t
-            spans.append((x_init, x_end))
-        elif z_hist[t + 1] == 1 and z_hist[t] == 0:
-            x_init = t + 1
-    return spans
+    z_hist = np.asarray(z_hist)
+    # Prepend a 0 so that a sequence starting in state 1 opens a span at t=0
+    starts = np.where(np.diff(z_hist, prepend=0) == 1)[0]
+    ends = np.where(np.diff(z_hist) == -1)[0]
+    return list(zip(starts, ends))
 
 
 def plot_inference(inference_values, z_hist, ax, state=1, map_estimate=False):
@@ -77,7 +81,17 @@ def plot_inference(inference_values, z_hist, ax, state=1, map_estimate=False):
     ax.set_xlabel("Observation number")
 
 
-def main():
+def main(use_jax=True):
+    """
+    Run the casino demo.
+
+    Parameters
+    ----------
+    use_jax: bool
+        Whether to sample and run inference with the jitted (lax.scan) versions
+        of the recursions, which avoid the per-step Python overhead, or with the
+        reference numpy implementations
+    """
     # state transition matrix
     A = np.array([[0.95, 0.05], [0.10, 0.90]])
 
@@ -91,21 +105,28 @@ def main():
 
     n_samples = 300
     init_state_dist = np.array([1, 1]) / 2
-    params = HMMNumpy(A, B, init_state_dist)
-    z_hist, x_hist = hmm_sample_numpy(params, n_samples, 314)
+    if use_jax:
+        params = HMMJax(jnp.array(A), jnp.array(B), jnp.array(init_state_dist))
+        # The latent chain is sampled with lax.scan over keys split up-front
+        z_hist, x_hist = hmm_sample_jax(params, n_samples, PRNGKey(314))
+        forwards_backwards, viterbi = hmm_forwards_backwards_jax, hmm_viterbi_jax
+    else:
+        params = HMMNumpy(A, B, init_state_dist)
+        z_hist, x_hist = hmm_sample_numpy(params, n_samples, 314)
+        forwards_backwards, viterbi = hmm_forwards_backwards_numpy, hmm_viterbi_numpy
 
-    z_hist_str = "".join((z_hist + 1).astype(str))[:60]
-    x_hist_str = "".join((x_hist + 1).astype(str))[:60]
+    z_hist_str = "".join((np.array(z_hist) + 1).astype(str))[:60]
+    x_hist_str = "".join((np.array(x_hist) + 1).astype(str))[:60]
 
     print("Printing sample observed/latent...")
     print(f"x: {x_hist_str}")
     print(f"z: {z_hist_str}")
 
     # Do inference
-    alpha, _, gamma, loglik = hmm_forwards_backwards_numpy(params, x_hist, len(x_hist))
+    alpha, _, gamma, loglik = forwards_backwards(params, x_hist, len(x_hist))
     print(f"Loglikelihood: {loglik}")
 
-    z_map = hmm_viterbi_numpy(params, x_hist)
+    z_map = viterbi(params, x_hist)
 
     dict_figures = {}
 
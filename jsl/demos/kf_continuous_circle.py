@@ -10,7 +10,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 from jax import random
 
-from jsl.demos.plot_utils import plot_ellipse
+from jsl.demos.plot_utils import plot_ellipses
 from jsl.lds.cont_kalman_filter import filter, sample
 from jsl.lds.kalman_filter import LDS
 
@@ -39,7 +39,7 @@ def main():
     step = 0.1
     vmin, vmax = -1.5, 1.5 + step
     X = np.mgrid[-1:1.5:step, vmin:vmax:step][::-1]
-    X_dot = jnp.einsum("ij,jxy->ixy", A, X)
+    X_dot = (A @ X.reshape(2, -1)).reshape(X.shape)
 
     dict_figures = {}
 
@@ -57,8 +57,7 @@ def main():
     ax.plot(*mu_hist.T, c="tab:orange", label="Filtered")
     ax.scatter(*sample_obs.T, marker="+", s=60, c="tab:green", label="observations")
     ax.scatter(*mu_hist[0], c="black", zorder=3)
-    for mut, Vt in zip(mu_hist[::4], V_hist[::4]):
-        plot_ellipse(Vt, mut, ax, plot_center=False, alpha=0.9, zorder=3)
+    plot_ellipses(V_hist[::4], mu_hist[::4], ax, alpha=0.9, zorder=3)
     plt.legend()
     field = ax.streamplot(*X, *X_dot, density=1.1, color="#ccccccaa")
     ax.legend()
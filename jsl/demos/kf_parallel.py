@@ -2,11 +2,13 @@
 # 4 missiles as described in the section "state-space models".
 # Each of the missiles is then filtered and smoothed in parallel
 
+import jax
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
 from jax import random
 
-from jsl.demos.plot_utils import plot_ellipse
+from jsl.demos.plot_utils import plot_ellipses
+from jsl.lds import cv2d_kalman
 from jsl.lds.kalman_filter import LDS, filter, smooth
 
 
@@ -41,11 +43,39 @@ def sample_filter_smooth(key, lds_model, nsteps, n_samples, noisy_init):
         Smoothed covariances Sigmat
     """
     z_hist, x_hist = lds_model.sample(key, nsteps, n_samples, noisy_init)
-    mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist = filter(lds_model, x_hist)
-    mu_hist_smooth, Sigma_hist_smooth = smooth(
-        lds_model, mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist
+    # Use the filter specialised to the sparse constant-velocity dynamics if possible
+    filter_fn = (
+        cv2d_kalman.filter if cv2d_kalman.is_constant_velocity(lds_model) else filter
     )
 
+    # filter and smooth are vmapped over the n_samples trajectories;
+    # jit both passes together so that all chains run as one program
+    @jax.jit
+    def filter_smooth(x_hist):
+        mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist = filter_fn(
+            lds_model, x_hist
+        )
+        mu_hist_smooth, Sigma_hist_smooth = smooth(
+            lds_model, mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist
+        )
+        return (
+            mu_hist,
+            Sigma_hist,
+            mu_cond_hist,
+            Sigma_cond_hist,
+            mu_hist_smooth,
+            Sigma_hist_smooth,
+        )
+
+    (
+        mu_hist,
+        Sigma_hist,
+        mu_cond_hist,
+        Sigma_cond_hist,
+        mu_hist_smooth,
+        Sigma_hist_smooth,
+    ) = filter_smooth(x_hist)
+
     return {
         "z_hist": z_hist,
         "x_hist": x_hist,
@@ -59,21 +89,21 @@ def sample_filter_smooth(key, lds_model, nsteps, n_samples, noisy_init):
 
 
 def plot_collection(obs, ax, means=None, covs=None, **kwargs):
-    n_samples, n_steps, _ = obs.shape
+    n_samples, *_ = obs.shape
     for nsim in range(n_samples):
         X = obs[nsim]
         if means is not None:
             mean = means[nsim]
             ax.scatter(*mean[0, :2], marker="o", s=20, c="black", zorder=2)
             ax.plot(*mean[:, :2].T, marker="o", markersize=2, **kwargs, zorder=1)
-            if covs is not None:
-                cov = covs[nsim]
-                for t in range(1, n_steps, 3):
-                    plot_ellipse(
-                        cov[t][:2, :2], mean[t, :2], ax, plot_center=False, alpha=0.7
-                    )
         ax.scatter(*X.T, marker="+", s=60)
 
+    if means is not None and covs is not None:
+        # Every third ellipse of every simulation, drawn as a single collection
+        cov_plot = covs[:, 1::3, :2, :2].reshape(-1, 2, 2)
+        mean_plot = means[:, 1::3, :2].reshape(-1, 2)
+        plot_ellipses(cov_plot, mean_plot, ax, alpha=0.7)
+
 
 def main():
     Δ = 1.0
@@ -4,7 +4,8 @@ import jax.numpy as jnp
 import matplotlib.pyplot as plt
 from jax import random
 
-from jsl.demos.plot_utils import plot_ellipse
+from jsl.demos.plot_utils import plot_ellipses
+from jsl.lds import cv2d_kalman
 from jsl.lds.kalman_filter import LDS, filter, smooth
 
 
@@ -19,7 +20,6 @@ def plot_tracking_values(observed, filtered, cov_hist, signal_label, ax):
         History of the retrieved (filtered) covariance matrices
     ax: matplotlib AxesSubplot
     """
-    timesteps, _ = observed.shape
     ax.plot(
         observed[:, 0],
         observed[:, 1],
@@ -34,9 +34,7 @@ def plot_tracking_values(observed, filtered, cov_hist, signal_label, ax):
     ax.plot(
         *filtered[:, :2].T, label=signal_label, c="tab:red", marker="x", linewidth=2
     )
-    for t in range(0, timesteps, 1):
-        covn = cov_hist[t][:2, :2]
-        plot_ellipse(covn, filtered[t, :2], ax, n_std=2.0, plot_center=False)
+    plot_ellipses(cov_hist[:, :2, :2], filtered[:, :2], ax, n_std=2.0)
     ax.axis("equal")
     ax.legend()
 
@@ -72,7 +70,11 @@ def sample_filter_smooth(key, lds_model, timesteps):
         Smoothed covariances Sigmat
     """
     z_hist, x_hist = lds_model.sample(key, timesteps)
-    mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist = filter(lds_model, x_hist)
+    # Use the filter specialised to the sparse constant-velocity dynamics if possible
+    filter_fn = (
+        cv2d_kalman.filter if cv2d_kalman.is_constant_velocity(lds_model) else filter
+    )
+    mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist = filter_fn(lds_model, x_hist)
     mu_hist_smooth, Sigma_hist_smooth = smooth(
         lds_model, mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist
     )
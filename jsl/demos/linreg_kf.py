@@ -10,14 +10,18 @@
 # where Q>0 allows for parameter  drift.
 # We show that the result is equivalent to batch (offline) Bayesian inference.
 
+from functools import partial
+
+import jax
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
-from numpy.linalg import inv
+from jax.scipy.linalg import cho_factor, cho_solve
 
 from jsl.lds.kalman_filter import LDS, kalman_filter
 
 
-def kf_linreg(X, y, R, mu0, Sigma0, F, Q):
+@partial(jax.jit, static_argnames=("return_history",))
+def kf_linreg(X, y, R, mu0, Sigma0, F, Q, return_history=True):
     """
     Online estimation of a linear regression
     using Kalman Filters
@@ -33,17 +37,19 @@ def kf_linreg(X, y, R, mu0, Sigma0, F, Q):
         Prior mean
     Sigma0: array(dimesion, dimension)
         Prior covariance matrix
+    return_history: bool
+        Whether to return the estimates at every step or only the last one
     Returns
     -------
-    * array(n_obs, dimension)
+    * array(n_obs, dimension) or array(dimension)
         Online estimation of parameters
-    * array(n_obs, dimension, dimension)
+    * array(n_obs, dimension, dimension) or array(dimension, dimension)
         Online estimation of uncertainty
     """
     C = lambda t: X[t][None, ...]
     lds = LDS(F, C, Q, R, mu0, Sigma0)
 
-    mu_hist, Sigma_hist, _, _ = kalman_filter(lds, y)
+    mu_hist, Sigma_hist, _, _ = kalman_filter(lds, y, return_history)
     return mu_hist, Sigma_hist
 
 
@@ -70,11 +76,18 @@ def posterior_lreg(X, y, R, mu0, Sigma0):
     * array(n_obs, dimension, dimension)
         Posterior covariance matrix
     """
-    Sn_bayes_inv = inv(Sigma0) + X.T @ X / R.item()
-    b = inv(Sigma0) @ mu0 + X.T @ y / R.item()
-    mn_bayes = jnp.linalg.solve(Sn_bayes_inv, b)
+    I = jnp.eye(len(mu0))
+    # A single Cholesky factorisation of Sigma0 gives both Sigma0^-1 mu0 and Sigma0^-1
+    sol0 = cho_solve(cho_factor(Sigma0), jnp.column_stack([mu0, I]))
+    Sigma0_inv_mu0, Sigma0_inv = sol0[:, 0], sol0[:, 1:]
+
+    # Information form: posterior precision and precision-weighted mean
+    Lambda = Sigma0_inv + X.T @ X / R.item()
+    eta = Sigma0_inv_mu0 + X.T @ y / R.item()
+    sol = cho_solve(cho_factor(Lambda), jnp.column_stack([eta, I]))
+    mn_bayes, Sn_bayes = sol[:, 0], sol[:, 1:]
 
-    return mn_bayes, Sn_bayes_inv
+    return mn_bayes, Sn_bayes
 
 
 def main():
@@ -122,8 +135,7 @@ def main():
     w0_err, w1_err = jnp.sqrt(Sigma_hist[:, [0, 1], [0, 1]].T)
 
     # Offline estimation
-    (w0_post, w1_post), inv_Sigma_post = posterior_lreg(X, y, R, mu0, Sigma0)
-    Sigma_post = inv(inv_Sigma_post)
+    (w0_post, w1_post), Sigma_post = posterior_lreg(X, y, R, mu0, Sigma0)
     w0_std, w1_std = jnp.sqrt(Sigma_post[[0, 1], [0, 1]])
 
     dict_figures = {}
@@ -6,9 +6,9 @@
 import jax
 import jax.numpy as jnp
 import matplotlib.pyplot as plt
+import numpy as np
 from jax import random
 
-# from jax.ops import index_update
 import jsl.nlds.bootstrap_filter as b_lib
 import jsl.nlds.extended_kalman_filter as ekf_lib
 import jsl.nlds.unscented_kalman_filter as ukf_lib
@@ -40,8 +40,10 @@ def main():
     qc = 0.06
     Q = jnp.array([[qc * dt**3 / 3, qc * dt**2 / 2], [qc * dt**2 / 2, qc * dt]])
 
+    # A single Partial shared by every NLDS below, instead of one lambda each
+    fz_bound = jax.tree_util.Partial(fz, g=g, dt=dt)
     fx_vmap = jax.vmap(fx)
-    fz_vec = jax.vmap(lambda x: fz(x, g=g, dt=dt))
+    fz_vec = jax.vmap(fz_bound)
 
     nsteps = 200
     Rt = jnp.eye(1) * 0.02
@@ -50,109 +52,93 @@ def main():
 
     key = random.PRNGKey(3141)
     key_samples, key_pf, key_noisy = random.split(key, 3)
-    model = NLDS(lambda x: fz(x, g=g, dt=dt), fx, Q, Rt)
+    model = NLDS(fz_bound, fx, Q, Rt)
     sample_state, sample_obs = model.sample(key, x0, nsteps)
 
     # *** Pertubed data ***
     key_noisy, key_values = random.split(key_noisy)
-    sample_obs_noise = sample_obs.copy()
     samples_map = random.bernoulli(key_noisy, 0.5, (nsteps,))
-    replacement_values = random.uniform(
-        key_values, (samples_map.sum(),), minval=-2, maxval=2
-    )
-    sample_obs_noise = sample_obs_noise.at[samples_map].set(replacement_values)
-    # sample_obs_noise = index_update(
-    #     sample_obs_noise.ravel(), samples_map, replacement_values
-    # )
-    colors = ["tab:red" if samp else "tab:blue" for samp in samples_map]
+    # Draw a candidate for every step and select, so that the number of
+    # replacements never has to be known on the host
+    replacements = random.uniform(key_values, (nsteps,), minval=-2, maxval=2)
+    sample_obs_noise = jnp.where(samples_map, replacements, sample_obs.ravel())
+    sample_obs_noise = sample_obs_noise.reshape(sample_obs.shape)
+    # Single device-to-host transfer instead of one per element
+    colors = np.where(np.asarray(samples_map), "tab:red", "tab:blue").tolist()
 
     # *** Perform filtering ****
     alpha, beta, kappa = 1, 0, 2
     state_size = 2
     Vinit = jnp.eye(state_size)
-    ukf = NLDS(lambda x: fz(x, g=g, dt=dt), fx, Q, Rt, alpha, beta, kappa, state_size)
+    ukf = NLDS(fz_bound, fx, Q, Rt, alpha, beta, kappa, state_size)
     particle_filter = NLDS(fz_vec, fx_vmap, Q, Rt)
 
+    # The EKF and UKF run on the clean and perturbed observations as one batch
+    obs_batch = jnp.stack([sample_obs, sample_obs_noise])
+    ekf_batched = jax.vmap(
+        lambda obs: ekf_lib.filter(model, x0, obs, return_params=["mean"])
+    )
+    ukf_batched = jax.vmap(lambda obs: ukf_lib.filter(ukf, x0, obs))
+
     print("Filtering data...")
-    _, ekf_hist = ekf_lib.filter(model, x0, sample_obs, return_params=["mean", "cov"])
-    ekf_mean_hist, ekf_Sigma_hist = ekf_hist["mean"], ekf_hist["cov"]
-    ukf_mean_hist, ukf_Sigma_hist = ukf_lib.filter(ukf, x0, sample_obs)
+    _, ekf_hists = ekf_batched(obs_batch)
+    ekf_mean_hist, ekf_perturbed_mean_hist = ekf_hists["mean"]
+    (ukf_mean_hist, ukf_perturbed_mean_hist), _ = ukf_batched(obs_batch)
     pf_mean_hist = b_lib.filter(
         particle_filter, key_pf, x0, sample_obs, nsamples=4_000, Vinit=Vinit
     )
 
     print("Filtering outlier data...")
-    _, ekf_perturbed_hist = ekf_lib.filter(
-        model, x0, sample_obs_noise, return_params=["mean", "cov"]
-    )
-    ekf_perturbed_mean_hist, ekf_Sigma_hist = (
-        ekf_perturbed_hist["mean"],
-        ekf_perturbed_hist["cov"],
-    )
-    ukf_perturbed_mean_hist, ukf_Sigma_hist = ukf_lib.filter(ukf, x0, sample_obs_noise)
     pf_perturbed_mean_hist = b_lib.filter(
         particle_filter, key_pf, x0, sample_obs_noise, nsamples=2_000
     )
 
-    ekf_estimate = fx_vmap(ekf_mean_hist)
-    ukf_estimate = fx_vmap(ukf_mean_hist)
-    pf_estimate = fx_vmap(pf_mean_hist)
-
-    ekf_perturbed_estimate = fx_vmap(ekf_perturbed_mean_hist)
-    ukf_perturbed_estimate = fx_vmap(ukf_perturbed_mean_hist)
-    pf_perturbed_estimate = fx_vmap(pf_perturbed_mean_hist)
-    ground_truth = fx_vmap(sample_state)
-
-    dict_figures = {}
-    # *** Plot results ***
-    fig, ax = plt.subplots()
-    plot_filter_true(ax, time, ekf_estimate, sample_obs, ground_truth, "Extended KF")
-    dict_figures["pendulum_ekf_1d_demo"] = fig
-
-    fig, ax = plt.subplots()
-    plot_filter_true(ax, time, ukf_estimate, sample_obs, ground_truth, "Unscented KF")
-    dict_figures["pendulum_ukf_1d_demo"] = fig
-
-    fig, ax = plt.subplots()
-    plot_filter_true(ax, time, pf_estimate, sample_obs, ground_truth, "Bootstrap PF")
-    dict_figures["pendulum_pf_1d_demo"] = fig
-
-    fig, ax = plt.subplots()
-    plot_filter_true(
-        ax,
-        time,
-        pf_perturbed_estimate,
-        sample_obs_noise,
-        ground_truth,
-        "Bootstrap PF (noisy)",
-        colors=colors,
+    # Map every state trajectory to the observation space in a single call
+    all_means = jnp.stack(
+        [
+            ekf_mean_hist,
+            ukf_mean_hist,
+            pf_mean_hist,
+            ekf_perturbed_mean_hist,
+            ukf_perturbed_mean_hist,
+            pf_perturbed_mean_hist,
+            sample_state,
+        ]
     )
-    dict_figures["pendulum_pf_noisy_1d_demo"] = fig
-
-    fig, ax = plt.subplots()
-    plot_filter_true(
-        ax,
-        time,
+    (
+        ekf_estimate,
+        ukf_estimate,
+        pf_estimate,
         ekf_perturbed_estimate,
-        sample_obs_noise,
-        ground_truth,
-        "Extended KF (noisy)",
-        colors=colors,
-    )
-    dict_figures["pendulum_ekf_noisy_1d_demo"] = fig
-
-    fig, ax = plt.subplots()
-    plot_filter_true(
-        ax,
-        time,
         ukf_perturbed_estimate,
-        sample_obs_noise,
+        pf_perturbed_estimate,
         ground_truth,
-        "Unscented KF (noisy)",
-        colors=colors,
-    )
-    dict_figures["pendulum_ukf_noisy_1d_demo"] = fig
+    ) = jax.vmap(fx_vmap)(all_means)
 
+    # *** Plot results ***
+    # One figure with a panel per filter: clean observations on the top row
+    # and perturbed observations on the bottom row
+    fig, axes = plt.subplots(2, 3, figsize=(15, 8), sharex=True, sharey=True)
+    estimates = [
+        (ekf_estimate, "Extended KF"),
+        (ukf_estimate, "Unscented KF"),
+        (pf_estimate, "Bootstrap PF"),
+    ]
+    for ax, (estimate, label) in zip(axes[0], estimates):
+        plot_filter_true(ax, time, estimate, sample_obs, ground_truth, label)
+
+    perturbed_estimates = [
+        (ekf_perturbed_estimate, "Extended KF (noisy)"),
+        (ukf_perturbed_estimate, "Unscented KF (noisy)"),
+        (pf_perturbed_estimate, "Bootstrap PF (noisy)"),
+    ]
+    for ax, (estimate, label) in zip(axes[1], perturbed_estimates):
+        plot_filter_true(
+            ax, time, estimate, sample_obs_noise, ground_truth, label, colors=colors
+        )
+    plt.tight_layout()
+
+    dict_figures = {"pendulum_1d_demo": fig}
     return dict_figures
 
 
@@ -2,6 +2,7 @@ import os
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import EllipseCollection
 from matplotlib.patches import Ellipse, transforms
 from mpl_toolkits.mplot3d import Axes3D
 from numpy import linalg
@@ -52,6 +53,50 @@ def plot_ellipse(
     return ax.add_patch(ellipse)
 
 
+def plot_ellipses(
+    Sigmas, mus, ax, n_std=3.0, facecolor="none", edgecolor="k", **kwargs
+):
+    """
+    Vectorised version of plot_ellipse: plot the n_std confidence ellipses
+    of a collection of 2d Gaussians as a single EllipseCollection.
+    The eigendecomposition of each 2x2 covariance is computed in closed form.
+
+    Parameters
+    ----------
+    Sigmas: array(n_ellipses, 2, 2)
+        Covariance matrices
+    mus: array(n_ellipses, 2)
+        Centers of the ellipses
+    ax: matplotlib AxesSubplot
+    n_std: float
+        Number of standard deviations spanned by each ellipse
+    """
+    Sigmas = np.asarray(Sigmas)
+    mus = np.asarray(mus)
+    a, b, c = Sigmas[:, 0, 0], Sigmas[:, 0, 1], Sigmas[:, 1, 1]
+
+    half_trace = (a + c) / 2
+    disc = np.sqrt(np.maximum(half_trace**2 - (a * c - b**2), 0.0))
+    lambda_major = half_trace + disc
+    lambda_minor = np.maximum(half_trace - disc, 0.0)
+    angles = np.degrees(0.5 * np.arctan2(2 * b, a - c))
+
+    ellipses = EllipseCollection(
+        2 * n_std * np.sqrt(lambda_major),
+        2 * n_std * np.sqrt(lambda_minor),
+        angles,
+        units="xy",
+        offsets=mus,
+        transOffset=ax.transData,
+        facecolors=facecolor,
+        edgecolors=edgecolor,
+        **kwargs,
+    )
+    ax.add_collection(ellipses)
+    ax.autoscale_view()
+    return ellipses
+
+
 def savedotfile(dotfiles):
     if "FIGDIR" in os.environ:
         figdir = os.environ["FIGDIR"]
@@ -16,7 +16,6 @@ import jax.numpy as jnp
 from jax import jit, lax, vmap
 from jax.nn import softmax
 from jax.random import PRNGKey, normal, split
-from jax.scipy.special import logit
 from scipy.special import softmax
 
 from jsl.hmm.hmm_utils import hmm_sample_minibatches
@@ -488,10 +487,9 @@ def hmm_viterbi_jax(params, obs_seq, length=None):
     if length is None:
         length = seq_len
 
-    trans_log_probs = jax.nn.log_softmax(logit(params.trans_mat))
-    init_log_probs = jax.nn.log_softmax(logit(params.init_dist))
-    obs_mat = logit(params.obs_mat)
-    n_states, *_ = obs_mat.shape
+    trans_log_probs = jnp.log(params.trans_mat)
+    init_log_probs = jnp.log(params.init_dist)
+    obs_mat = jnp.log(params.obs_mat)
 
     first_log_prob = init_log_probs + obs_mat[:, obs_seq[0]]
 
@@ -521,8 +519,7 @@ def hmm_viterbi_jax(params, obs_seq, length=None):
     )
 
     def viterbi_backward(state, most_likely_sources):
-        state = jax.nn.one_hot(state, n_states)
-        most_likely = jnp.sum(most_likely_sources * state).astype(jnp.int64)
+        most_likely = most_likely_sources[state]
         return most_likely, most_likely
 
     final_state = jnp.argmax(final_log_prob)
@@ -29,6 +29,7 @@ from jsl.hmm.hmm_numpy_lib import (
     HMMNumpy,
     hmm_forwards_backwards_numpy,
     hmm_loglikelihood_numpy,
+    hmm_viterbi_numpy,
 )
 
 tfd = tfp.distributions
@@ -91,6 +92,27 @@ def test_all_hmm_models():
     assert np.allclose(ll_numpy, ll_jax, atol=4)
 
 
+def test_viterbi_numpy():
+    # Occasionally dishonest casino
+    A = jnp.array([[0.95, 0.05], [0.10, 0.90]])
+    B = jnp.array(
+        [
+            [1 / 6, 1 / 6, 1 / 6, 1 / 6, 1 / 6, 1 / 6],  # fair die
+            [1 / 10, 1 / 10, 1 / 10, 1 / 10, 1 / 10, 5 / 10],  # loaded die
+        ]
+    )
+    pi = jnp.array([1, 1]) / 2
+
+    params_numpy = HMMNumpy(np.array(A), np.array(B), np.array(pi))
+    params_jax = HMMJax(A, B, pi)
+
+    _, observations = hmm_sample_jax(params_jax, 300, PRNGKey(314))
+
+    z_map_numpy = hmm_viterbi_numpy(params_numpy, np.array(observations))
+    z_map_jax = hmm_viterbi_jax(params_jax, observations)
+    assert np.array_equal(z_map_jax, z_map_numpy)
+
+
 def test_inference():
     seed = 0
     rng_key = PRNGKey(seed)
@@ -11,7 +11,7 @@ import distrax
 import flax
 import jax.numpy as jnp
 from jax import jit, lax, vmap
-from jax.nn import log_softmax, logsumexp, one_hot
+from jax.nn import log_softmax, logsumexp
 from jax.random import split
 
 """
@@ -320,8 +320,6 @@ def hmm_viterbi_log(params, obs_seq, length=None):
     trans_log_probs = log_softmax(trans_dist.logits)
     init_log_probs = log_softmax(init_dist.logits)
 
-    n_states = obs_dist.batch_shape[0]
-
     first_log_prob = init_log_probs + obs_dist.log_prob(obs_seq[0])
 
     if seq_len == 1:
@@ -361,13 +359,7 @@ def hmm_viterbi_log(params, obs_seq, length=None):
     )
 
     def viterbi_backward(state, t):
-        state = jnp.where(
-            t <= length,
-            jnp.sum(most_likely_sources[t] * one_hot(state, n_states)).astype(
-                jnp.int64
-            ),
-            state,
-        )
+        state = jnp.where(t <= length, most_likely_sources[t, state], state)
         most_likely = jnp.where(t <= length, state, -1)
         return state, most_likely
 
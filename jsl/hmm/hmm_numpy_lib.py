@@ -7,7 +7,6 @@
 
 from dataclasses import dataclass
 
-import jax
 import numpy as np
 from jax.nn import softmax
 from numpy.random import seed
@@ -287,8 +286,6 @@ def hmm_viterbi_numpy(params, obs_seq):
         np.log(params.init_dist),
     )
 
-    n_states, _ = obs_mat.shape
-
     first_prob = init_dist + obs_mat[:, obs_seq[0]]
 
     if len(obs_seq) == 1:
@@ -320,10 +317,8 @@ def hmm_viterbi_numpy(params, obs_seq):
     most_likely_path, state = [], final_state
 
     for most_likely_source in reversed(most_likely_sources[1:]):
-        state = jax.nn.one_hot(state, n_states)
-        most_likely = np.sum(most_likely_source * state).astype(np.int64)
-        state = most_likely
-        most_likely_path.append(most_likely)
+        state = most_likely_source[state]
+        most_likely_path.append(state)
 
     return np.append(np.flip(most_likely_path), final_state)
 
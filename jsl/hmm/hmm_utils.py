@@ -41,12 +41,11 @@ def hmm_sample_minibatches(observations, valid_lens, batch_size, rng_key):
     num_train = len(observations)
     perm = permutation(rng_key, num_train)
 
-    def create_mini_batch(batch_idx):
-        return observations[batch_idx], valid_lens[batch_idx]
-
     num_batches = num_train // batch_size
     batch_indices = perm.reshape((num_batches, -1))
-    minibatches = vmap(create_mini_batch)(batch_indices)
+    # A single gather with the (num_batches, batch_size) index array
+    # builds every minibatch at once
+    minibatches = observations[batch_indices], valid_lens[batch_indices]
     return minibatches
 
 
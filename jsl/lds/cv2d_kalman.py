@@ -0,0 +1,208 @@
+# Kalman filter specialised to the 2d constant-velocity (CV) model
+#   A = [[1, 0, dt, 0], [0, 1, 0, dt], [0, 0, 1, 0], [0, 0, 0, 1]]
+#   C = [[1, 0, 0, 0], [0, 1, 0, 0]]
+# The sparsity of A and C is hard-coded, so the predict and update steps
+# reduce to block additions and slices instead of dense 4x4 products.
+# The outputs match those of jsl.lds.kalman_filter.filter.
+
+from functools import partial
+
+import chex
+import jax.numpy as jnp
+import numpy as np
+from jax import jit, lax, tree_map, vmap
+from jax.scipy.linalg import solve
+
+from jsl.lds.kalman_filter import LDS
+
+
+def is_constant_velocity(params: LDS) -> bool:
+    """
+    Check whether a time-invariant LDS without offsets
+    follows the 2d constant-velocity model
+
+    Parameters
+    ----------
+    params: LDS
+         Linear Dynamical System object
+
+    Returns
+    -------
+    * bool
+    """
+    A, C, Q, R = params.A, params.C, params.Q, params.R
+    if any(callable(M) for M in (A, C, Q, R)):
+        return False
+    if params.state_offset is not None or params.obs_offset is not None:
+        return False
+
+    A, C = np.asarray(A), np.asarray(C)
+    if A.shape != (4, 4) or C.shape != (2, 4):
+        return False
+
+    dt = A[0, 2]
+    I = np.eye(2)
+    A_cv = np.block([[I, dt * I], [np.zeros((2, 2)), I]])
+    C_cv = np.eye(2, 4)
+    return np.allclose(A, A_cv) and np.allclose(C, C_cv)
+
+
+def kalman_predict(mu, Sigma, dt, Q):
+    """
+    Calculate the Kalman filter predict step of the CV model.
+
+    Parameters
+    ----------
+    mu: array(4)
+         Posterior estimate of mu from previous time step, mu_{t-1}.
+    Sigma: array(4, 4)
+         Posterior estimate of Sigma from previous time step, Sigma_{t-1}.
+    dt: float
+        Sampling period
+    Q: array(4, 4)
+        Transition covariance matrix
+
+    Returns
+    -------
+    * array(4):
+        Predicted mean at current time step, mu_{t|t-1}
+    * array(4, 4)
+        Predicted covariance at current time step, Sigma_{t|t-1}
+    """
+    pos, vel = mu[:2], mu[2:]
+    mu_pred = jnp.concatenate([pos + dt * vel, vel])
+
+    # A Sigma A.T written in terms of the 2x2 position/velocity blocks
+    S11, S12 = Sigma[:2, :2], Sigma[:2, 2:]
+    S21, S22 = Sigma[2:, :2], Sigma[2:, 2:]
+    S12_pred = S12 + dt * S22
+    S21_pred = S21 + dt * S22
+    S11_pred = S11 + dt * S21 + dt * S12_pred
+    Sigma_pred = jnp.block([[S11_pred, S12_pred], [S21_pred, S22]]) + Q
+
+    return mu_pred, Sigma_pred
+
+
+def kalman_update(mu_pred, Sigma_pred, obs, R):
+    """
+    Calculate the Kalman filter update step of the CV model.
+
+    Parameters
+    ----------
+    mu_pred: array(4)
+         Prediction of mu_{t|t-1} from mu_{t-1} and dynamics.
+    Sigma_pred: array(4, 4)
+         Prediction of Sigma_{t|t-1} from Sigma_{t-1} and dynamics.
+    obs: array(2)
+         Observation at time, t.
+    R: array(2, 2)
+        Observation covariance matrix
+
+    Returns
+    -------
+    * array(4):
+        Updated mean mu_t
+    * array(4, 4)
+        Updated covariance Sigma_t
+    """
+    # C only selects the position, so C Sigma C.T and C mu are slices
+    St = Sigma_pred[:2, :2] + R
+    Kt = solve(St, Sigma_pred[:2, :], sym_pos=True).T
+
+    innovation = obs - mu_pred[:2]
+    mu = mu_pred + Kt @ innovation
+
+    # Expanded Joseph form (I − KtC)Σt|t−1(I − KtC)T + KtRtKTt
+    KS = Kt @ Sigma_pred[:2, :]
+    Sigma = Sigma_pred - KS - KS.T + Kt @ St @ Kt.T
+
+    return mu, Sigma
+
+
+def kalman_step(state, obs, dt, Q, R):
+    mu, Sigma = state
+    mu_pred, Sigma_pred = kalman_predict(mu, Sigma, dt, Q)
+    mu, Sigma = kalman_update(mu_pred, Sigma_pred, obs, R)
+
+    return (mu, Sigma), (mu, Sigma, mu_pred, Sigma_pred)
+
+
+@jit
+def kalman_filter(mu0, Sigma0, dt, Q, R, x_hist):
+    """
+    Run the CV Kalman filter over a single trajectory
+
+    Parameters
+    ----------
+    mu0: array(4)
+        Mean of initial configuration
+    Sigma0: array(4, 4)
+        Covariance of initial configuration
+    dt: float
+        Sampling period
+    Q: array(4, 4)
+        Transition covariance matrix
+    R: array(2, 2)
+        Observation covariance matrix
+    x_hist: array(timesteps, 2)
+
+    Returns
+    -------
+    * array(timesteps, 4):
+        Filtered means mu_{1:T}
+    * array(timesteps, 4, 4)
+        Filtered covariances Sigma_{1:T}
+    * array(timesteps - 1, 4)
+        Filtered conditional means mu_{t|t-1} for t=2, ..., T.
+    * array(timesteps - 1, 4, 4)
+        Filtered conditional covariances Sigma_{t|t-1} for t=2, ..., T.
+    """
+    # Filtering the first observation does not include a predict step.
+    mu0_post, Sigma0_post = kalman_update(mu0, Sigma0, x_hist[0], R)
+
+    kalman_step_run = partial(kalman_step, dt=dt, Q=Q, R=R)
+    _, history = lax.scan(kalman_step_run, (mu0_post, Sigma0_post), x_hist[1:])
+    mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist = history
+
+    mu_hist = jnp.vstack((mu0_post, mu_hist))
+    Sigma_hist = jnp.concatenate((Sigma0_post[None, ...], Sigma_hist))
+    return mu_hist, Sigma_hist, mu_cond_hist, Sigma_cond_hist
+
+
+def filter(params: LDS, x_hist: chex.Array):
+    """
+    Drop-in replacement of jsl.lds.kalman_filter.filter for
+    linear dynamical systems that satisfy is_constant_velocity.
+    As in the general case, x_hist can optionally be of dimensionality
+    three, corresponding to different samples of the same underlying LDS.
+
+    Parameters
+    ----------
+    params: LDS
+         Linear Dynamical System object following the CV model
+    x_hist: array(n_samples?, timesteps, 2)
+
+    Returns
+    -------
+    * array(n_samples?, timesteps, 4):
+        Filtered means mut
+    * array(n_samples?, timesteps, 4, 4)
+        Filtered covariances Sigmat
+    * array(n_samples?, timesteps, 4)
+        Filtered conditional means mut|t-1
+    * array(n_samples?, timesteps, 4, 4)
+        Filtered conditional covariances Sigmat|t-1
+    """
+    has_one_sim = False
+    if x_hist.ndim == 2:
+        x_hist = x_hist[None, ...]
+        has_one_sim = True
+
+    dt = params.A[0, 2]
+    kalman_map = vmap(kalman_filter, (None, None, None, None, None, 0))
+    outputs = kalman_map(params.mu, params.Sigma, dt, params.Q, params.R, x_hist)
+
+    if has_one_sim:
+        outputs = tree_map(lambda x: x[0, ...], outputs)
+
+    return outputs
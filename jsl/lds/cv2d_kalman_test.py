@@ -0,0 +1,46 @@
+import numpy as np
+from jax import numpy as jnp
+from jax import random
+
+from jsl.lds import cv2d_kalman
+from jsl.lds.kalman_filter import LDS, filter
+
+
+def test_cv2d_kalman_filter():
+    key = random.PRNGKey(314)
+    num_timesteps = 15
+    n_samples = 4
+    delta = 0.5
+
+    ### LDS Parameters ###
+    A = jnp.array(
+        [[1, 0, delta, 0], [0, 1, 0, delta], [0, 0, 1, 0], [0, 0, 0, 1]]
+    ).astype(float)
+    C = jnp.array([[1, 0, 0, 0], [0, 1, 0, 0]]).astype(float)
+    Q = jnp.eye(4) * 0.01
+    R = jnp.eye(2) * 1.2
+
+    ### Prior distribution params ###
+    mu0 = jnp.array([8, 10, 1, 0]).astype(float)
+    Sigma0 = jnp.eye(4) * 0.1
+
+    ### Sample data ###
+    lds_instance = LDS(A, C, Q, R, mu0, Sigma0)
+    assert cv2d_kalman.is_constant_velocity(lds_instance)
+    A_coupled = A.at[0, 1].set(0.3)
+    assert not cv2d_kalman.is_constant_velocity(LDS(A_coupled, C, Q, R, mu0, Sigma0))
+    assert not cv2d_kalman.is_constant_velocity(LDS(A, C[:1], Q, R, mu0, Sigma0))
+
+    _, x_hist = lds_instance.sample(key, num_timesteps, n_samples)
+
+    cv_output = cv2d_kalman.filter(lds_instance, x_hist)
+    general_output = filter(lds_instance, x_hist)
+
+    for cv_term, general_term in zip(cv_output, general_output):
+        assert np.allclose(cv_term, general_term, atol=1e-5)
+
+    cv_output = cv2d_kalman.filter(lds_instance, x_hist[0])
+    general_output = filter(lds_instance, x_hist[0])
+
+    for cv_term, general_term in zip(cv_output, general_output):
+        assert np.allclose(cv_term, general_term, atol=1e-5)
@@ -326,7 +326,14 @@ def kalman_filter(params: LDS, x_hist: chex.Array, return_history: bool = True):
     # Filtering the first observation does not include a predict step.
     mu0_post, Sigma0_post = kalman_update(mu0, Sigma0, x0, 0, params)
 
-    kalman_step_run = partial(kalman_step, params=params)
+    if return_history:
+        kalman_step_run = partial(kalman_step, params=params)
+    else:
+        # Only carry the latest state instead of stacking the full history
+        def kalman_step_run(state, obs):
+            state, _ = kalman_step(state, obs, params)
+            return state, None
+
     (mu_T, Sigma_T, _), history = lax.scan(
         kalman_step_run, (mu0_post, Sigma0_post, 1), x_hist[1:, ...]
     )
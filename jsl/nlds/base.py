@@ -12,6 +12,7 @@
 # Author: Gerardo Durán-Martín (@gerdm)
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Callable
 
 import chex
@@ -45,6 +46,14 @@ class NLDS:
     kappa: float = 0.0
     d: int = 0
 
+    @cached_property
+    def Dfz(self):
+        """
+        Jacobian of the state transition function. It is built once per
+        system so that filters and smoothers share the same function.
+        """
+        return jax.jacrev(self.fz)
+
     def Qz(self, z, *args):
         if callable(self.Q):
             return self.Q(z, *args)
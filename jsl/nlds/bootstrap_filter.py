@@ -1,13 +1,14 @@
 """
 Implementation of the Bootrstrap Filter for discrete time systems
 **This implementation considers the case of multivariate normals**
+Particles are resampled at every step using systematic resampling.
 
 
 """
 
 import chex
 import jax.numpy as jnp
-from jax import lax, random
+from jax import jit, lax, random
 from jax.scipy import stats
 
 from jsl.nlds.base import NLDS
@@ -33,11 +34,7 @@ def filter(
     fx, fz = params.fx, params.fz
     Q, R = params.Qz, params.Rx
 
-    key, key_init = random.split(key, 2)
     V = Q(init_state) if Vinit is None else Vinit
-    zt_rvs = random.multivariate_normal(key_init, init_state, V, shape=(nsamples,))
-
-    init_state = (zt_rvs, key)
 
     def __filter_step(state, obs_t):
         indices = jnp.arange(nsamples)
@@ -51,8 +48,11 @@ def filter(
         xt_rvs = fx(zt_rvs)
         weights_t = stats.multivariate_normal.pdf(obs_t, xt_rvs, R(zt_rvs, obs_t))
 
-        # 3. Resampling
-        pi = random.choice(key_reindex, indices, p=weights_t, shape=(nsamples,))
+        # 3. Systematic resampling: a single uniform draw shared by
+        #    nsamples evenly spaced points on the weights' CDF
+        cdf = jnp.cumsum(weights_t) / weights_t.sum()
+        u = (random.uniform(key_reindex) + indices) / nsamples
+        pi = jnp.minimum(jnp.searchsorted(cdf, u), nsamples - 1)
         zt_rvs = zt_rvs[pi, ...]
         weights_t = jnp.ones(nsamples) / nsamples
 
@@ -62,6 +62,13 @@ def filter(
 
         return (zt_rvs, key_next), mu_t
 
-    _, mu_hist = lax.scan(__filter_step, init_state, sample_obs)
+    # Sample the initial particles and run the whole trajectory
+    # as a single compiled program
+    @jit
+    def __filter(key, init_state, V, sample_obs):
+        key, key_init = random.split(key, 2)
+        zt_rvs = random.multivariate_normal(key_init, init_state, V, shape=(nsamples,))
+        _, mu_hist = lax.scan(__filter_step, (zt_rvs, key), sample_obs)
+        return mu_hist
 
-    return mu_hist
+    return __filter(key, init_state, V, sample_obs)
@@ -9,6 +9,7 @@ from typing import Tuple
 import chex
 import jax.numpy as jnp
 from jax import jacrev, lax
+from jax.scipy.linalg import cho_factor, cho_solve
 
 from .base import NLDS
 
@@ -66,9 +67,11 @@ def filter(
         Rt = R(mu_t_cond, *obs)
         xt_hat = fx(mu_t_cond, *obs)
         xi = xt - xt_hat
-        A = jnp.linalg.inv(Rt + jnp.einsum("id,jd,d->ij", Ht, Ht, Vt))
-        mu_t = mu_t_cond + jnp.einsum("s,is,ij,j->s", Vt, Ht, A, xi)
-        Vt = Vt - jnp.einsum("s,is,ij,is,s->s", Vt, Ht, A, Ht, Vt) + Q(mu_t, t)
+        # Cholesky factor of the innovation covariance Rt + Ht diag(Vt) Ht^T
+        St = cho_factor(Rt + (Ht * Vt) @ Ht.T)
+        mu_t = mu_t_cond + Vt * (Ht.T @ cho_solve(St, xi))
+        # Diagonal of diag(Vt) Ht^T St^{-1} Ht diag(Vt)
+        Vt = Vt - Vt * jnp.sum(Ht * cho_solve(St, Ht), axis=0) * Vt + Q(mu_t, t)
 
         return (mu_t, Vt, t + 1), (mu_t, None)
 
@@ -0,0 +1,49 @@
+import numpy as np
+from jax import numpy as jnp
+from jax import random
+
+from jsl.nlds import diagonal_extended_kalman_filter as dekf
+from jsl.nlds.base import NLDS
+
+
+def diagonal_ekf(mu, V, Q, R, y_hist, X_hist):
+    """
+    Reference diagonal EKF for a random-walk state observed through
+    y(t) = X(t) @ z(t) + noise: run the full-covariance update
+    from diag(V) and keep only the diagonal of the posterior
+    """
+    mu_hist = []
+    for yt, Xt in zip(y_hist, X_hist):
+        P = np.diag(V)
+        S = Xt @ P @ Xt.T + R
+        K = P @ Xt.T @ np.linalg.inv(S)
+        mu = mu + K @ (yt - Xt @ mu)
+        V = np.diag(P - K @ Xt @ P) + Q
+        mu_hist.append(mu)
+
+    return np.stack(mu_hist), V
+
+
+def test_diagonal_extended_kalman_filter():
+    key = random.PRNGKey(314)
+    key_X, key_y = random.split(key)
+    num_timesteps, obs_size, state_size = 30, 3, 4
+
+    X_hist = random.normal(key_X, (num_timesteps, obs_size, state_size))
+    z_true = jnp.arange(state_size) - 1.5
+    y_hist = X_hist @ z_true + random.normal(key_y, (num_timesteps, obs_size))
+
+    mu0 = jnp.zeros(state_size)
+    V0 = jnp.ones(state_size) * 2.0
+    Q = jnp.ones(state_size) * 1e-3
+    R = jnp.eye(obs_size) * 0.5
+
+    model = NLDS(lambda z: z, lambda z, X: X @ z, Q, R)
+    (mu, V), (mu_hist, _) = dekf.filter(model, mu0, y_hist, X_hist, V0)
+
+    mu0, V0, Q, R = np.asarray(mu0), np.asarray(V0), np.asarray(Q), np.asarray(R)
+    y_hist, X_hist = np.asarray(y_hist), np.asarray(X_hist)
+    mu_ref_hist, V_ref = diagonal_ekf(mu0, V0, Q, R, y_hist, X_hist)
+
+    assert np.allclose(mu_hist, mu_ref_hist, atol=1e-4)
+    assert np.allclose(V, V_ref, atol=1e-4)
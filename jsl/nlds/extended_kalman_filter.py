@@ -14,6 +14,7 @@ def filter_step(
     params: NLDS,
     Dfx: Callable,
     Dfz: Callable,
+    eye: chex.Array,
     eps: float,
     return_params: Dict,
 ) -> Tuple[Tuple[chex.Array, chex.Array, int], Dict]:
@@ -32,6 +33,8 @@ def filter_step(
         Jacobian of the observation function
     Dfz: Callable
         Jacobian of the state transition function
+    eye: array(state_size, state_size)
+        Identity matrix of the state space
     eps: float
         Small number to prevent singular matrix
     return_params: list
@@ -46,8 +49,6 @@ def filter_step(
     mu_t, Vt, t = state
     obs, inputs = xs
 
-    state_size, *_ = mu_t.shape
-    I = jnp.eye(state_size)
     Gt = Dfz(mu_t)
     mu_t_cond = params.fz(mu_t)
     Vt_cond = Gt @ Vt @ Gt.T + params.Qz(mu_t, t)
@@ -60,7 +61,7 @@ def filter_step(
     Mt = Ht @ Vt_cond @ Ht.T + Rt + eps * jnp.eye(num_inputs)
     Kt = Vt_cond @ Ht.T @ jnp.linalg.inv(Mt)
     mu_t = mu_t_cond + Kt @ (obs - obs_hat)
-    Vt = (I - Kt @ Ht) @ Vt_cond @ (I - Kt @ Ht).T + Kt @ Rt @ Kt.T
+    Vt = (eye - Kt @ Ht) @ Vt_cond @ (eye - Kt @ Ht).T + Kt @ Rt @ Kt.T
 
     carry = {"mean": mu_t, "cov": Vt, "obs_hat": obs_hat}
     carry = {key: val for key, val in carry.items() if key in return_params}
@@ -76,6 +77,7 @@ def filter(
     return_params: List = None,
     eps: float = 0.001,
     return_history: bool = True,
+    Dfz: Callable = None,
 ):
     """
     Run the Extended Kalman Filter algorithm over a set of observed samples.
@@ -93,6 +95,8 @@ def filter(
         "mean", "cov"
     return_history: bool
         Whether to return the history of mu and sigma obtained at each step
+    Dfz: function or None
+        Jacobian of the state transition function. Defaults to params.Dfz
 
     Returns
     -------
@@ -103,10 +107,10 @@ def filter(
     """
     state_size, *_ = init_state.shape
 
-    fz, fx = params.fz, params.fx
+    fx = params.fx
     Q, R = params.Qz, params.Rx
 
-    Dfz = jacrev(fz)
+    Dfz = params.Dfz if Dfz is None else Dfz
     Dfx = jacrev(fx)
 
     Vt = Q(init_state) if Vinit is None else Vinit
@@ -123,6 +127,7 @@ def filter(
         params=params,
         Dfx=Dfx,
         Dfz=Dfz,
+        eye=jnp.eye(state_size),
         eps=eps,
         return_params=return_params,
     )
@@ -1,6 +1,6 @@
 # Extended Rauch-Tung-Striebel smoother or Extended Kalman Smoother (EKS)
 from functools import partial
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, NamedTuple, Tuple
 
 import chex
 import jax
@@ -11,30 +11,34 @@ from jsl.nlds import extended_kalman_filter as ekf
 from .base import NLDS
 
 
+class SmoothOut(NamedTuple):
+    mean: chex.Array
+    cov: chex.Array
+
+
 def smooth_step(
     state: Tuple[chex.Array, chex.Array, int],
     xs: Tuple[chex.Array, chex.Array],
     params: NLDS,
     Dfz: Callable,
+    eye: chex.Array,
     eps: float,
-    return_params: Dict,
-) -> Tuple[Tuple[chex.Array, chex.Array, int], Dict]:
+) -> Tuple[Tuple[chex.Array, chex.Array, int], SmoothOut]:
     mean_next, cov_next, t = state
     mean_kf, cov_kf = xs
 
+    Gt = Dfz(mean_kf)
     mean_next_hat = params.fz(mean_kf)
-    cov_next_hat = Dfz(mean_kf) @ cov_kf @ Dfz(mean_kf).T + params.Qz(mean_kf, t)
-    cov_next_hat_eps = cov_next_hat + eps * jnp.eye(mean_next_hat.shape[0])
-    kalman_gain = jnp.linalg.solve(cov_next_hat_eps, Dfz(mean_kf).T) @ cov_kf
+    cov_next_hat = Gt @ cov_kf @ Gt.T + params.Qz(mean_kf, t)
+    cov_next_hat_eps = cov_next_hat + eps * eye
+    # kalman_gain = cov_kf @ Gt.T @ inv(cov_next_hat_eps)
+    kalman_gain = cov_kf @ jnp.linalg.solve(cov_next_hat_eps.T, Gt).T
 
     mean_prev = mean_kf + kalman_gain @ (mean_next - mean_next_hat)
     cov_prev = cov_kf + kalman_gain @ (cov_next - cov_next_hat) @ kalman_gain.T
 
     prev_state = (mean_prev, cov_prev, t - 1)
-    carry = {"mean": mean_prev, "cov": cov_prev}
-    carry = {key: val for key, val in carry.items() if key in return_params}
-
-    return prev_state, carry
+    return prev_state, SmoothOut(mean_prev, cov_prev)
 
 
 def smooth(
@@ -48,7 +52,7 @@ def smooth(
     return_filter_history: bool = False,
 ) -> Dict[str, Dict[str, chex.Array]]:
     kf_params = ["mean", "cov"]
-    Dfz = jax.jacrev(params.fz)
+    Dfz = params.Dfz
     _, hist_filter = ekf.filter(
         params,
         init_state,
@@ -58,18 +62,27 @@ def smooth(
         return_params=kf_params,
         eps=eps,
         return_history=True,
+        Dfz=Dfz,
     )
     kf_hist_mean, kf_hist_cov = hist_filter["mean"], hist_filter["cov"]
     kf_last_mean, kf_hist_mean = kf_hist_mean[-1], kf_hist_mean[:-1]
     kf_last_cov, kf_hist_cov = kf_hist_cov[-1], kf_hist_cov[:-1]
 
-    smooth_step_partial = partial(
-        smooth_step, params=params, Dfz=Dfz, eps=eps, return_params=return_params
-    )
+    # Built once and closed over, rather than inside every smoothing step
+    eye = jnp.eye(kf_last_mean.shape[0])
+    smooth_step_partial = partial(smooth_step, params=params, Dfz=Dfz, eye=eye, eps=eps)
 
     init_state = (kf_last_mean, kf_last_cov, len(kf_hist_mean) - 1)
     xs = (kf_hist_mean, kf_hist_cov)
-    _, hist_smooth = jax.lax.scan(smooth_step_partial, init_state, xs, reverse=True)
+    _, smooth_out = jax.lax.scan(smooth_step_partial, init_state, xs, reverse=True)
+
+    # The scan always outputs a SmoothOut; keep the requested terms
+    return_params = [] if return_params is None else return_params
+    hist_smooth = {
+        key: getattr(smooth_out, key)
+        for key in SmoothOut._fields
+        if key in return_params
+    }
 
     hist = {
         "smooth": hist_smooth,
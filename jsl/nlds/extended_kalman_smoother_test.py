@@ -0,0 +1,59 @@
+import numpy as np
+from jax import numpy as jnp
+from jax import random
+
+from jsl.nlds import extended_kalman_smoother as eks
+from jsl.nlds.base import NLDS
+
+
+def rts_smoother(A, Q, mean_hist, cov_hist):
+    """
+    Reference Rauch-Tung-Striebel recursion for a linear transition
+    with a known history of filtered means and covariances
+    """
+    mean_smooth, cov_smooth = mean_hist[-1], cov_hist[-1]
+    mean_smooth_hist, cov_smooth_hist = [], []
+    for mean_kf, cov_kf in zip(mean_hist[-2::-1], cov_hist[-2::-1]):
+        cov_pred = A @ cov_kf @ A.T + Q
+        gain = cov_kf @ A.T @ np.linalg.inv(cov_pred)
+        mean_smooth = mean_kf + gain @ (mean_smooth - A @ mean_kf)
+        cov_smooth = cov_kf + gain @ (cov_smooth - cov_pred) @ gain.T
+        mean_smooth_hist.append(mean_smooth)
+        cov_smooth_hist.append(cov_smooth)
+
+    return np.stack(mean_smooth_hist[::-1]), np.stack(cov_smooth_hist[::-1])
+
+
+def test_extended_kalman_smoother_linear():
+    key = random.PRNGKey(314)
+    num_timesteps = 20
+
+    # Linear system with a rotating, non-symmetric transition
+    A = jnp.array([[0.9, 0.2], [-0.3, 0.8]])
+    C = jnp.array([[1.0, 0.5]])
+    Q = jnp.eye(2) * 0.1
+    R = jnp.eye(1) * 0.5
+    x0 = jnp.array([1.0, -1.0])
+
+    model = NLDS(lambda z: A @ z, lambda z, *args: C @ z, Q, R)
+    _, x_hist = model.sample(key, x0, num_timesteps)
+
+    hist = eks.smooth(
+        model,
+        x0,
+        x_hist,
+        Vinit=jnp.eye(2),
+        return_params=["mean", "cov"],
+        eps=0.0,
+        return_filter_history=True,
+    )
+    mean_filter, cov_filter = hist["filter"]["mean"], hist["filter"]["cov"]
+    mean_smooth, cov_smooth = hist["smooth"]["mean"], hist["smooth"]["cov"]
+
+    A, Q = np.asarray(A), np.asarray(Q)
+    mean_ref, cov_ref = rts_smoother(
+        A, Q, np.asarray(mean_filter), np.asarray(cov_filter)
+    )
+
+    assert np.allclose(mean_smooth, mean_ref, atol=1e-4)
+    assert np.allclose(cov_smooth, cov_ref, atol=1e-4)